@@ -1,7 +1,8 @@
 """Authentication service for Firebase Functions."""
 
+from functools import lru_cache
+
 from firebase_functions import https_fn
-from typing import Optional
 
 from ..config.settings import settings
 from ..utils.app_logging import get_logger
@@ -47,16 +48,10 @@ class AuthService:
             return False
 
 
-# Global auth service instance
-_auth_service: Optional[AuthService] = None
-
-
+@lru_cache(maxsize=None)
 def get_auth_service() -> AuthService:
     """Get or create the auth service instance."""
-    global _auth_service
-    if _auth_service is None:
-        _auth_service = AuthService()
-    return _auth_service
+    return AuthService()
 
 
 def verify_token(request: https_fn.Request) -> bool:
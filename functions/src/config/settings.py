@@ -29,6 +29,10 @@ class Settings:
         self.reservation_exp_check_url: Optional[str] = os.environ.get("RESERVATION_EXP_CHECK_URL")
         self.task_schedule_delay: int = int(os.environ.get("TASK_SCHEDULE_DELAY", "300"))  # 5 minutes default
         
+        # Geohash configuration; only enable prefix queries once every event
+        # document carries the geohash_prefix_{precision} fields
+        self.geohash_prefix_queries: bool = os.environ.get("GEOHASH_PREFIX_QUERIES", "false").lower() == "true"
+        
         # Email configuration
         self.brevo_smtp_api_key: Optional[str] = os.environ.get("BREVO_SMTP_API_KEY")
         self.brevo_smtp_base_url: Optional[str] = os.environ.get("BREVO_SMTP_BASE_URL")
@@ -1,7 +1,7 @@
 """Email service using Brevo API."""
 
-import os
 import requests
+from functools import lru_cache
 from typing import Dict, Optional
 from datetime import datetime
 
@@ -10,6 +10,9 @@ from ..utils.app_logging import get_logger
 
 logger = get_logger(__name__)
 
+# (connect, read) timeouts in seconds; fail fast when Brevo is unreachable
+_REQUEST_TIMEOUT = (5, 30)
+
 
 class EmailService:
     """Centralized email service using Brevo API."""
@@ -25,6 +28,20 @@ class EmailService:
             raise ValueError("BREVO_SMTP_API_KEY environment variable is required")
         if not self.base_url:
             raise ValueError("BREVO_SMTP_BASE_URL environment variable is required")
+        
+        # Keep the connection to Brevo alive across sends on a warm instance
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+            "api-key": self.api_key
+        })
+        
+        # The sender is the same for every email, so build it once
+        self.sender = {
+            "email": self.sender_email,
+            "name": self.sender_name
+        }
     
     def _format_event_date(self, date_value) -> str:
         """
@@ -86,17 +103,8 @@ class EmailService:
         Returns:
             Dict containing the API response
         """
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "api-key": self.api_key
-        }
-        
         payload = {
-            "sender": {
-                "email": self.sender_email,
-                "name": self.sender_name
-            },
+            "sender": self.sender,
             "to": [
                 {
                     "email": to_email,
@@ -116,11 +124,10 @@ class EmailService:
                 payload["textContent"] = text_content
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/smtp/email",
-                headers=headers,
                 json=payload,
-                timeout=30
+                timeout=_REQUEST_TIMEOUT
             )
             response.raise_for_status()
             
@@ -264,16 +271,10 @@ This is an automated message from Chome System
         return text.strip()
 
 
-# Global email service instance
-_email_service: Optional[EmailService] = None
-
-
+@lru_cache(maxsize=None)
 def get_email_service() -> EmailService:
     """Get or create the email service instance."""
-    global _email_service
-    if _email_service is None:
-        _email_service = EmailService()
-    return _email_service
+    return EmailService()
 
 
 def send_reservation_confirmation_email(
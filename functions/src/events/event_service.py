@@ -2,20 +2,25 @@
 
 import os
 import uuid
+from functools import lru_cache
 from urllib.parse import urlparse, unquote
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from firebase_functions import https_fn
 from firebase_admin import storage
 from google.cloud.firestore_v1.document import DocumentReference
 
+from ..config.settings import settings
 from ..utils.firestore_client import get_firestore_client
 from ..utils.app_logging import get_logger
-from ..utils.geohash import encode_geohash, query_events_by_radius
+from ..utils.geohash import encode_geohash, geohash_prefix_fields, query_events_by_radius
 from ..utils.http_responses import json_response, json_error_response
 
 logger = get_logger(__name__)
 
+# Firestore limit on the number of writes in a single batch
+MAX_BATCH_WRITES = 500
+
 
 class EventService:
     """Service for handling event-related operations."""
@@ -47,17 +52,22 @@ class EventService:
         try:
             logger.info("Starting event association duplication")
             
+            # Fetch both events in a single round trip
+            snapshots = self._get_snapshots([old_event_ref, new_event_ref])
+            old_event_doc = snapshots.get(old_event_ref.path)
+            new_event_doc = snapshots.get(new_event_ref.path)
+            
             # Verify both events exist
-            if not old_event_ref.get().exists:
+            if not old_event_doc or not old_event_doc.exists:
                 logger.error(f"Old event {old_event_ref.id} not found")
                 return https_fn.Response("Old event not found", 404)
             
-            if not new_event_ref.get().exists:
+            if not new_event_doc or not new_event_doc.exists:
                 logger.error(f"New event {new_event_ref.id} not found")
                 return https_fn.Response("New event not found", 404)
             
-            old_event_data = old_event_ref.get().to_dict()
-            new_event_data = new_event_ref.get().to_dict()
+            old_event_data = old_event_doc.to_dict()
+            new_event_data = new_event_doc.to_dict()
             
             logger.info(f"Duplicating from event '{old_event_data.get('name')}' to '{new_event_data.get('name')}'")
             
@@ -125,30 +135,17 @@ class EventService:
         )
         
         logger.info(f"Found {len(questions)} questions to duplicate")
-        duplicated_count = 0
+        new_questions = []
         
         for question in questions:
-            try:
-                data = question.to_dict()
-                logger.info(f"Duplicating question: {question.id} - {data.get('questionText', 'No text')}")
-                
-                # Update event reference
-                data["event"] = new_event_ref
-                
-                # Create new question
-                question_ref = self.db.collection("event_survey_question").document()
-                question_ref.set(data)
-                
-                if question_ref.get().exists:
-                    logger.info(f"Question duplicated with ID: {question_ref.id}")
-                    duplicated_count += 1
-                else:
-                    logger.error(f"Failed to duplicate question: {question.id}")
-                    
-            except Exception as e:
-                logger.error(f"Error duplicating question {question.id}: {str(e)}")
+            data = question.to_dict()
+            logger.info(f"Duplicating question: {question.id} - {data.get('questionText', 'No text')}")
+            
+            # Update event reference
+            data["event"] = new_event_ref
+            new_questions.append(data)
         
-        return duplicated_count
+        return self._create_documents("event_survey_question", new_questions)
     
     def _duplicate_media(
         self, 
@@ -163,7 +160,7 @@ class EventService:
         )
         
         logger.info(f"Found {len(medias)} media items to duplicate")
-        duplicated_count = 0
+        new_medias = []
         
         for media in medias:
             try:
@@ -185,21 +182,12 @@ class EventService:
                 # Update data with new path and event reference
                 data["path"] = new_media_path
                 data["event"] = new_event_ref
-                
-                # Create new media document
-                media_ref = self.db.collection("event_media").document()
-                media_ref.set(data)
-                
-                if media_ref.get().exists:
-                    logger.info(f"Media duplicated with ID: {media_ref.id}")
-                    duplicated_count += 1
-                else:
-                    logger.error(f"Failed to create media document for: {original_path}")
+                new_medias.append(data)
                     
             except Exception as e:
                 logger.error(f"Error duplicating media {media.id}: {str(e)}")
         
-        return duplicated_count
+        return self._create_documents("event_media", new_medias)
     
     def _delete_questions(self, event_ref: DocumentReference) -> int:
         """Delete all questions associated with an event."""
@@ -210,25 +198,12 @@ class EventService:
         )
         
         logger.info(f"Found {len(questions)} questions to delete")
-        deleted_count = 0
         
         for question in questions:
-            try:
-                question_text = question.to_dict().get("questionText", "No text")
-                logger.info(f"Deleting question: {question.id} - {question_text}")
-                
-                question.reference.delete()
-                
-                if not question.reference.get().exists:
-                    logger.info(f"Question {question.id} deleted successfully")
-                    deleted_count += 1
-                else:
-                    logger.error(f"Failed to delete question: {question.id}")
-                    
-            except Exception as e:
-                logger.error(f"Error deleting question {question.id}: {str(e)}")
+            question_text = question.to_dict().get("questionText", "No text")
+            logger.info(f"Deleting question: {question.id} - {question_text}")
         
-        return deleted_count
+        return self._delete_documents([question.reference for question in questions])
     
     def _delete_media(self, event_ref: DocumentReference) -> int:
         """Delete all media files and documents associated with an event."""
@@ -239,7 +214,7 @@ class EventService:
         )
         
         logger.info(f"Found {len(medias)} media items to delete")
-        deleted_count = 0
+        media_refs = []
         
         for media in medias:
             try:
@@ -254,18 +229,67 @@ class EventService:
                 else:
                     logger.warning(f"Failed to delete media file: {media_path}")
                 
-                # Delete the media document
-                media.reference.delete()
-                
-                if not media.reference.get().exists:
-                    logger.info(f"Media document {media.id} deleted successfully")
-                    deleted_count += 1
-                else:
-                    logger.error(f"Failed to delete media document: {media.id}")
+                # Keep the document unless the file step raised, so a file
+                # left in storage is still referenced
+                media_refs.append(media.reference)
                     
             except Exception as e:
                 logger.error(f"Error deleting media {media.id}: {str(e)}")
         
+        # Delete the media documents
+        return self._delete_documents(media_refs)
+    
+    def _get_snapshots(self, refs: List[DocumentReference]) -> Dict[str, Any]:
+        """Fetch several documents in a single request, keyed by document path."""
+        return {snapshot.reference.path: snapshot for snapshot in self.db.get_all(refs)}
+    
+    def _create_documents(self, collection_name: str, documents: List[Dict[str, Any]]) -> int:
+        """
+        Create documents with auto-generated IDs using batched writes.
+        
+        A failed batch stops the remaining ones, but batches committed before
+        it stay committed and are included in the returned count.
+        """
+        created_count = 0
+        
+        for start in range(0, len(documents), MAX_BATCH_WRITES):
+            chunk = documents[start:start + MAX_BATCH_WRITES]
+            try:
+                batch = self.db.batch()
+                for data in chunk:
+                    doc_ref = self.db.collection(collection_name).document()
+                    batch.set(doc_ref, data)
+                    logger.info(f"Document queued for creation in {collection_name}: {doc_ref.id}")
+                batch.commit()
+            except Exception as e:
+                logger.error(f"Error creating documents in {collection_name}: {str(e)}")
+                break
+            created_count += len(chunk)
+        
+        return created_count
+    
+    def _delete_documents(self, refs: List[DocumentReference]) -> int:
+        """
+        Delete documents using batched writes.
+        
+        A failed batch stops the remaining ones, but batches committed before
+        it stay committed and are included in the returned count.
+        """
+        deleted_count = 0
+        
+        for start in range(0, len(refs), MAX_BATCH_WRITES):
+            chunk = refs[start:start + MAX_BATCH_WRITES]
+            try:
+                batch = self.db.batch()
+                for ref in chunk:
+                    batch.delete(ref)
+                batch.commit()
+            except Exception as e:
+                logger.error(f"Error deleting documents: {str(e)}")
+                break
+            deleted_count += len(chunk)
+        
+        logger.info(f"Deleted {deleted_count} documents")
         return deleted_count
     
     def _duplicate_media_file(self, original_path: str) -> Optional[str]:
@@ -370,7 +394,8 @@ class EventService:
                 center_lat, 
                 center_lng, 
                 radius_meters,
-                collection_name
+                collection_name,
+                use_prefix_fields=settings.geohash_prefix_queries
             )
             
             logger.info(f"Found {len(matching_events)} events within radius")
@@ -466,8 +491,8 @@ class EventService:
             geohash = encode_geohash(latitude, longitude, precision=10)
             logger.info(f"Generated geohash '{geohash}' for {context} {event_id} at ({latitude}, {longitude})")
             
-            # Update the document with the geohash
-            doc_ref.update({"geohash": geohash})
+            # Update the document with the geohash and its prefixes for "in" queries
+            doc_ref.update({"geohash": geohash, **geohash_prefix_fields(geohash)})
             logger.info(f"Successfully updated geohash for {context} {event_id}")
             return True
             
@@ -479,16 +504,10 @@ class EventService:
             return False
 
 
-# Global event service instance
-_event_service: Optional[EventService] = None
-
-
+@lru_cache(maxsize=None)
 def get_event_service() -> EventService:
     """Get or create the event service instance."""
-    global _event_service
-    if _event_service is None:
-        _event_service = EventService()
-    return _event_service
+    return EventService()
 
 
 def duplicate_event_associations(
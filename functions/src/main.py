@@ -1,5 +1,10 @@
 """Main Firebase Functions module for Chome."""
 
+import logging
+import re
+from typing import Any
+from urllib.parse import unquote_plus
+
 from firebase_functions import https_fn
 from firebase_functions.firestore_fn import (
     on_document_deleted,
@@ -9,7 +14,7 @@ from firebase_functions.firestore_fn import (
     DocumentSnapshot,
     Change,
 )
-from firebase_admin import initialize_app
+import firebase_admin
 
 from .config.settings import settings
 from .utils.app_logging import get_logger
@@ -22,12 +27,18 @@ from .reservations import (
     schedule_reservation_expiration_check,
 )
 
-# Initialize Firebase app
-app = initialize_app()
+# Initialize Firebase app once per instance and reuse it on warm invocations
+try:
+    app = firebase_admin.get_app()
+except ValueError:
+    app = firebase_admin.initialize_app()
 
 # Get logger
 logger = get_logger(__name__)
 
+# Matches the search_events_nearby query parameters in any order
+_SEARCH_QUERY_PARAM = re.compile(r"(?:^|&)(lat|lng|radius|collection)=([^&]*)")
+
 
 # Validate settings on startup
 try:
@@ -38,6 +49,28 @@ except ValueError as e:
     raise
 
 
+def _get_snapshot_field(snapshot: DocumentSnapshot, field: str) -> Any:
+    """Read a single field from a snapshot without materializing the whole document."""
+    try:
+        return snapshot.get(field)
+    except KeyError:
+        return None
+
+
+def _get_position(snapshot: DocumentSnapshot | None) -> Any:
+    """Read the position field of an event snapshot, if any."""
+    return _get_snapshot_field(snapshot, "position") if snapshot else None
+
+
+def _positions_equal(before_snapshot: DocumentSnapshot | None, after_snapshot: DocumentSnapshot | None) -> bool:
+    """Check whether the position field is unchanged between two event snapshots."""
+    before_position = _get_position(before_snapshot)
+    after_position = _get_position(after_snapshot)
+    if type(before_position) is not type(after_position):
+        return False
+    return before_position == after_position
+
+
 @on_document_updated(document='event_reservation/{res_id}', region=settings.region)
 def on_reservation_confirmed(event: Event[Change[DocumentSnapshot]]) -> https_fn.Response:
     """
@@ -205,18 +238,24 @@ def on_user_created(event: Event[DocumentSnapshot | None]) -> https_fn.Response:
             logger.error("Missing user document reference")
             return https_fn.Response("Missing user document reference", 400)
         
-        doc_data = event.data.to_dict()
-        if not doc_data:
+        snapshot = event.data
+        if not snapshot.exists:
             logger.error("Missing user document data")
             return https_fn.Response("Missing user document data", 400)
         
         logger.info(f"User created: {doc_ref.id}")
-        logger.info(f"User data: {doc_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"User data: {snapshot.to_dict()}")
         
         # Get current field values
-        display_name = doc_data.get('display_name')
-        first_name = doc_data.get('firstName')
-        last_name = doc_data.get('lastName')
+        display_name = _get_snapshot_field(snapshot, 'display_name')
+        first_name = _get_snapshot_field(snapshot, 'firstName')
+        last_name = _get_snapshot_field(snapshot, 'lastName')
+        
+        # All fields are present (the common signup case), no action needed
+        if display_name and first_name and last_name:
+            logger.info("All name fields are present, no updates needed")
+            return https_fn.Response("User name fields are complete", 200)
         
         updates = {}
         
@@ -240,12 +279,7 @@ def on_user_created(event: Event[DocumentSnapshot | None]) -> https_fn.Response:
             updates['display_name'] = f"{first_name.strip()} {last_name.strip()}"
             logger.info(f"Created display_name: '{updates['display_name']}'")
         
-        # Case 3: All fields are present, no action needed
-        elif display_name and first_name and last_name:
-            logger.info("All name fields are present, no updates needed")
-            return https_fn.Response("User name fields are complete", 200)
-        
-        # Case 4: No name fields present, no action possible
+        # Case 3: No name fields present, no action possible
         elif not display_name and not first_name and not last_name:
             logger.info("No name fields present, cannot create missing fields")
             return https_fn.Response("No name fields present", 200)
@@ -280,11 +314,16 @@ def search_events_nearby(req: https_fn.Request) -> https_fn.Response:
     - collection: Optional collection name (defaults to 'event')
     """
     try:
-        # Get query parameters
-        lat_str = req.args.get("lat")
-        lng_str = req.args.get("lng")
-        radius_str = req.args.get("radius")
-        collection_name = req.args.get("collection", "event")
+        # Get query parameters with a single pass over the raw query string
+        # Like req.args, the first occurrence of a repeated parameter wins and
+        # undecodable bytes are replaced instead of failing the request
+        params = {}
+        for name, value in _SEARCH_QUERY_PARAM.findall(req.query_string.decode(errors="replace")):
+            params.setdefault(name, unquote_plus(value))
+        lat_str = params.get("lat")
+        lng_str = params.get("lng")
+        radius_str = params.get("radius")
+        collection_name = params.get("collection", "event")
         
         # Validate required parameters
         if not lat_str:
@@ -332,20 +371,13 @@ def on_event_position_updated(event: Event[Change[DocumentSnapshot]]) -> https_f
             logger.error("Missing document reference")
             return https_fn.Response("Missing document reference", 400)
         
-        # Get the before and after data to detect position changes
-        before_data = before_snapshot.to_dict() if before_snapshot else {}
-        after_data = after_snapshot.to_dict() if after_snapshot else {}
-        
-        # Check if position field has changed
-        before_position = before_data.get("position")
-        after_position = after_data.get("position")
-        
-        # Check if position has changed
-        if before_position == after_position:
+        # Compare only the position field instead of materializing both documents
+        if _positions_equal(before_snapshot, after_snapshot):
             logger.info(f"Event {doc_ref.id} position unchanged, skipping geohash update")
             return https_fn.Response("Position unchanged", 200)
         
         # Process geohash if position exists and has changed
+        after_position = _get_position(after_snapshot)
         if process_event_position(doc_ref, after_position, doc_ref.id, "event update"):
             return https_fn.Response("Geohash updated successfully", 200)
         else:
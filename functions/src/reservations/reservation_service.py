@@ -1,10 +1,12 @@
 """Reservation service for handling reservation-related operations."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 from firebase_functions import https_fn
-from google.cloud import tasks_v2
+from google.api_core.exceptions import AlreadyExists
+from google.cloud import firestore, tasks_v2
 from google.protobuf import timestamp_pb2
 from sqlite3.dbapi2 import Timestamp
 
@@ -15,6 +17,55 @@ from ..email.email_service import send_reservation_confirmation_email
 
 logger = get_logger(__name__)
 
+# Outcomes of the transactional expiration check
+_RES_NOT_FOUND = "not_found"
+_RES_CONFIRMED = "confirmed"
+_RES_DELETED = "deleted"
+_RES_VALID = "valid"
+
+
+@firestore.transactional
+def _expire_reservation(transaction: firestore.Transaction, doc_ref) -> str:
+    """
+    Read a reservation and delete it if expired, atomically.
+    
+    Running the read and the delete in the same transaction prevents deleting
+    a reservation that was confirmed between the two calls.
+    
+    Args:
+        transaction: Firestore transaction
+        doc_ref: Reference to the reservation document
+        
+    Returns:
+        One of the _RES_* outcome constants
+    """
+    res_doc = doc_ref.get(transaction=transaction)
+    
+    if not res_doc.exists:
+        return _RES_NOT_FOUND
+    
+    res_data = res_doc.to_dict()
+    
+    # Check if already confirmed
+    if res_data.get("confirmed") is True:
+        return _RES_CONFIRMED
+    
+    # Reservations without createdAt are invalid and get deleted
+    if "createdAt" not in res_data:
+        logger.warning(f"Reservation {doc_ref.id} has no createdAt field, deleting")
+        transaction.delete(doc_ref)
+        return _RES_DELETED
+    
+    # Check expiration
+    res_timestamp = res_data.get("createdAt").timestamp()
+    current_timestamp = Timestamp.now().timestamp()
+    
+    if current_timestamp - res_timestamp > settings.reservation_exp_time:
+        transaction.delete(doc_ref)
+        return _RES_DELETED
+    
+    return _RES_VALID
+
 
 class ReservationService:
     """Service for handling reservation-related operations."""
@@ -57,8 +108,12 @@ class ReservationService:
                 logger.error(f"User not found for reservation {res_id}")
                 return https_fn.Response("User not found", 404)
             
-            # Get event data
-            event_data = self._get_event_data(res_data.get("event"))
+            # Get event data, stored either as a document ID or a reference
+            event_ref = res_data.get("event")
+            if isinstance(event_ref, str):
+                event_data = self._get_event_data_by_id(event_ref)
+            else:
+                event_data = self._get_event_data_by_ref(event_ref)
             
             # Prepare reservation data for email
             reservation_data = {
@@ -106,32 +161,18 @@ class ReservationService:
             logger.info(f"Checking expiration for reservation: {reservation_id}")
             
             doc_ref = self.db.collection("event_reservation").document(reservation_id)
-            res_doc = doc_ref.get()
+            outcome = _expire_reservation(self.db.transaction(), doc_ref)
             
-            if not res_doc.exists:
+            if outcome == _RES_NOT_FOUND:
                 logger.warning(f"Reservation {reservation_id} not found")
                 return https_fn.Response("Reservation not found", 404)
             
-            res_data = res_doc.to_dict()
-            
-            # Check if already confirmed
-            if res_data.get("confirmed") is True:
+            if outcome == _RES_CONFIRMED:
                 logger.info(f"Reservation {reservation_id} already confirmed")
                 return https_fn.Response("Reservation already confirmed", 200)
             
-            # Check if createdAt exists
-            if "createdAt" not in res_data:
-                logger.warning(f"Reservation {reservation_id} has no createdAt field, deleting")
-                doc_ref.delete()
-                return https_fn.Response("Reservation deleted", 200)
-            
-            # Check expiration
-            res_timestamp = res_data.get("createdAt").timestamp()
-            current_timestamp = Timestamp.now().timestamp()
-            
-            if current_timestamp - res_timestamp > settings.reservation_exp_time:
-                logger.info(f"Reservation {reservation_id} expired, deleting")
-                doc_ref.delete()
+            if outcome == _RES_DELETED:
+                logger.info(f"Reservation {reservation_id} expired, deleted")
                 return https_fn.Response("Reservation deleted", 200)
             
             logger.info(f"Reservation {reservation_id} still valid")
@@ -159,14 +200,6 @@ class ReservationService:
         try:
             logger.info(f"Scheduling expiration check for reservation: {res_id}")
             
-            # Verify reservation exists
-            doc_ref = self.db.collection("event_reservation").document(res_id)
-            res_doc = doc_ref.get()
-            
-            if not res_doc.exists:
-                logger.error(f"Reservation {res_id} not found")
-                return https_fn.Response("Reservation not found", 404)
-            
             # Create Cloud Task
             parent = self.tasks_client.queue_path(
                 settings.gcp_project_id,
@@ -180,7 +213,10 @@ class ReservationService:
             timestamp = timestamp_pb2.Timestamp()
             timestamp.FromDatetime(scheduled_time)
             
+            # Named tasks are deduplicated by Cloud Tasks, so trigger retries
+            # for the same reservation cannot enqueue a second check
             task = {
+                "name": f"{parent}/tasks/expire-{res_id}",
                 "http_request": {
                     "http_method": "GET",
                     "url": f"{settings.reservation_exp_check_url}?res_id={res_id}",
@@ -191,7 +227,11 @@ class ReservationService:
                 "schedule_time": timestamp
             }
             
-            response = self.tasks_client.create_task(request={"parent": parent, "task": task})
+            try:
+                response = self.tasks_client.create_task(request={"parent": parent, "task": task})
+            except AlreadyExists:
+                logger.info(f"Expiration check already scheduled for reservation: {res_id}")
+                return https_fn.Response("Task already scheduled", 200)
             
             if response.name:
                 logger.info(f"Created task: {response.name}")
@@ -228,38 +268,44 @@ class ReservationService:
             logger.error(f"Error getting user data: {str(e)}")
             return None
     
-    def _get_event_data(self, event_ref) -> Dict[str, Any]:
-        """Get event data from event reference."""
-        if not event_ref:
+    def _get_event_data_by_id(self, event_id: str) -> Dict[str, Any]:
+        """Get event data from an event ID or document path."""
+        # Clean the event ID - remove any path separators and get just the ID
+        event_id = event_id.strip()
+        if '/' in event_id:
+            event_id = event_id.split('/')[-1]
+        
+        if not event_id:
+            logger.warning(f"Invalid event ID: '{event_id}'")
             return {}
         
         try:
-            if isinstance(event_ref, str):
-                # Clean the event_ref - remove any path separators and get just the ID
-                event_id = event_ref.strip()
-                if '/' in event_id:
-                    event_id = event_id.split('/')[-1]
-                
-                if event_id and event_id.strip():
-                    event_doc_ref = self.db.collection("event").document(event_id)
-                    event_doc = event_doc_ref.get()
-                    if event_doc.exists:
-                        return event_doc.to_dict()
-                    else:
-                        logger.warning(f"Event document {event_id} does not exist")
-                else:
-                    logger.warning(f"Invalid event ID: '{event_id}'")
+            event_doc = self.db.collection("event").document(event_id).get()
+            if event_doc.exists:
+                return event_doc.to_dict()
             
-            elif hasattr(event_ref, 'get'):
-                # It's a document reference
-                event_doc = event_ref.get()
-                if event_doc.exists:
-                    return event_doc.to_dict()
-                else:
-                    logger.warning("Event document reference does not exist")
-            else:
-                logger.warning(f"Unexpected event reference type: {type(event_ref)}")
+            logger.warning(f"Event document {event_id} does not exist")
+            return {}
             
+        except Exception as e:
+            logger.error(f"Error getting event data: {str(e)}")
+            return {}
+    
+    def _get_event_data_by_ref(self, event_ref) -> Dict[str, Any]:
+        """Get event data from an event document reference."""
+        if not event_ref:
+            return {}
+        
+        if not hasattr(event_ref, 'get'):
+            logger.warning(f"Unexpected event reference type: {type(event_ref)}")
+            return {}
+        
+        try:
+            event_doc = event_ref.get()
+            if event_doc.exists:
+                return event_doc.to_dict()
+            
+            logger.warning("Event document reference does not exist")
             return {}
             
         except Exception as e:
@@ -267,16 +313,10 @@ class ReservationService:
             return {}
 
 
-# Global reservation service instance
-_reservation_service: Optional[ReservationService] = None
-
-
+@lru_cache(maxsize=None)
 def get_reservation_service() -> ReservationService:
     """Get or create the reservation service instance."""
-    global _reservation_service
-    if _reservation_service is None:
-        _reservation_service = ReservationService()
-    return _reservation_service
+    return ReservationService()
 
 
 def send_reservation_confirmation(res_id: str) -> https_fn.Response:
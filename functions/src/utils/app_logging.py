@@ -14,6 +14,9 @@ def get_logger(name: str = "chome_functions") -> logging.Logger:
         _logger = logging.getLogger(name)
         _logger.setLevel(logging.INFO)
         
+        # The handler below already emits records; don't repeat them via the root logger
+        _logger.propagate = False
+        
         # Create console handler if not already present
         if not _logger.handlers:
             handler = logging.StreamHandler()
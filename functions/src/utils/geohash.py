@@ -1,9 +1,118 @@
-"""Geohash utility functions for location-based queries using pygeohash library."""
+"""Geohash utility functions for location-based queries."""
 
 import math
-from typing import Tuple, Any, Dict
-import pygeohash as pgh
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Tuple, Any, Dict, Optional
+import numpy as np
 from datetime import datetime
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+from google.cloud.firestore import DocumentReference, GeoPoint
+
+from .app_logging import get_logger
+
+logger = get_logger(__name__)
+
+# Mean Earth radius in meters
+EARTH_RADIUS_METERS = 6371000.0
+_EARTH_DIAMETER_METERS = 2 * EARTH_RADIUS_METERS
+_DEG_TO_RAD = math.pi / 180.0
+
+# Great-circle length of one degree on the sphere used for all distances
+_METERS_PER_DEGREE = EARTH_RADIUS_METERS * _DEG_TO_RAD
+
+# Geohash base32 alphabet, and a translation of both its cases onto the digits
+# int(..., 32) understands; every other ASCII character maps to an invalid digit
+_BASE32_CHARS = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_TO_INT_DIGITS = {code: "!" for code in range(128)}
+_BASE32_TO_INT_DIGITS.update(
+    (ord(char), digit)
+    for chars in (_BASE32_CHARS, _BASE32_CHARS.upper())
+    for char, digit in zip(chars, "0123456789abcdefghijklmnopqrstuv")
+)
+
+# Scale factors mapping coordinates onto 32-bit unsigned integers
+_LAT_TO_INT = (1 << 32) / 180.0
+_LNG_TO_INT = (1 << 32) / 360.0
+_MAX_UINT32 = 0xFFFFFFFF
+
+# Quantization steps for cached query bounds; the padding covers the worst-case
+# center shift from rounding so cached bounds stay a superset of exact ones
+_BOUNDS_DEGREE_STEP = 0.0001
+_BOUNDS_RADIUS_STEP = 1.0
+_BOUNDS_CENTER_PAD = math.hypot(_BOUNDS_DEGREE_STEP / 2, _BOUNDS_DEGREE_STEP / 2) * _METERS_PER_DEGREE
+
+# Bounds cache limits: entries, and the largest cell grid worth caching
+_BOUNDS_CACHE_SIZE = 256
+_BOUNDS_CACHE_MAX_CELLS = 256
+
+# Query precision by radius: radii above _RADIUS_BREAKS[i] use _RADIUS_PRECISIONS[i + 1].
+# Precision 4 covers both 10-100km and 100-1000km to ensure we capture all geohashes
+_RADIUS_BREAKS = (100, 1000, 10000, 100000, 1000000)
+_RADIUS_PRECISIONS = (7, 6, 5, 4, 4, 3)
+
+# Precisions stored as exact geohash_prefix_{precision} fields on event documents
+GEOHASH_PREFIX_PRECISIONS = (5, 6, 7)
+
+# Maximum number of values Firestore accepts in a single "in" filter
+_IN_QUERY_MAX_VALUES = 30
+
+# Half the cell height and width in degrees, indexed by geohash precision
+_LAT_ERR = [90.0 / (2 ** (precision * 5 // 2)) for precision in range(13)]
+_LNG_ERR = [180.0 / (2 ** ((precision * 5 + 1) // 2)) for precision in range(13)]
+
+
+def _convert_identity(data: Any) -> Any:
+    """Return JSON-native values unchanged."""
+    return data
+
+
+def _convert_dict(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert every value of a dict."""
+    return {key: _convert_firestore_to_json_serializable(value) for key, value in data.items()}
+
+
+def _convert_list(data: list) -> list:
+    """Convert every item of a list."""
+    return [_convert_firestore_to_json_serializable(item) for item in data]
+
+
+def _convert_isoformat(data: datetime) -> str:
+    """Convert a datetime to an ISO format string."""
+    return data.isoformat()
+
+
+def _convert_document_reference(data: DocumentReference) -> Dict[str, str]:
+    """Convert a DocumentReference to its id and path."""
+    return {
+        '_type': 'DocumentReference',
+        'id': data.id,
+        'path': data.path
+    }
+
+
+def _convert_geopoint(data: GeoPoint) -> Dict[str, float]:
+    """Convert a GeoPoint to a simple lat/lng dict."""
+    return {
+        'latitude': data.latitude,
+        'longitude': data.longitude
+    }
+
+
+# Converters keyed by exact type, covering JSON primitives and Firestore types
+_CONVERTERS = {
+    dict: _convert_dict,
+    list: _convert_list,
+    str: _convert_identity,
+    int: _convert_identity,
+    float: _convert_identity,
+    bool: _convert_identity,
+    type(None): _convert_identity,
+    datetime: _convert_isoformat,
+    DatetimeWithNanoseconds: _convert_isoformat,
+    DocumentReference: _convert_document_reference,
+    GeoPoint: _convert_geopoint,
+}
 
 
 def _convert_firestore_to_json_serializable(data: Any) -> Any:
@@ -16,6 +125,11 @@ def _convert_firestore_to_json_serializable(data: Any) -> Any:
     Returns:
         JSON-serializable data
     """
+    converter = _CONVERTERS.get(type(data))
+    if converter is not None:
+        return converter(data)
+    
+    # Fall back to duck typing for subclasses and other types
     if isinstance(data, dict):
         return {key: _convert_firestore_to_json_serializable(value) for key, value in data.items()}
     elif isinstance(data, list):
@@ -49,9 +163,71 @@ def _convert_firestore_to_json_serializable(data: Any) -> Any:
         return data
 
 
+def _spread_bits(value: int) -> int:
+    """Spread the 32 bits of value onto the even bit positions of a 64-bit integer."""
+    value = (value | (value << 16)) & 0x0000FFFF0000FFFF
+    value = (value | (value << 8)) & 0x00FF00FF00FF00FF
+    value = (value | (value << 4)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value << 2)) & 0x3333333333333333
+    value = (value | (value << 1)) & 0x5555555555555555
+    return value
+
+
+def _squash_bits(value: int) -> int:
+    """Collect the even bits of a 64-bit integer into a 32-bit integer (inverse of _spread_bits)."""
+    value &= 0x5555555555555555
+    value = (value | (value >> 1)) & 0x3333333333333333
+    value = (value | (value >> 2)) & 0x0F0F0F0F0F0F0F0F
+    value = (value | (value >> 4)) & 0x00FF00FF00FF00FF
+    value = (value | (value >> 8)) & 0x0000FFFF0000FFFF
+    value = (value | (value >> 16)) & 0x00000000FFFFFFFF
+    return value
+
+
+def _encode_int(latitude: float, longitude: float, bits: int) -> int:
+    """Encode coordinates into the integer bit pattern of a geohash with the given number of bits."""
+    lat_int = min(int((latitude + 90.0) * _LAT_TO_INT), _MAX_UINT32)
+    lng_int = min(int((longitude + 180.0) * _LNG_TO_INT), _MAX_UINT32)
+    return (_spread_bits(lat_int) | (_spread_bits(lng_int) << 1)) >> (64 - bits)
+
+
+def _decode_int(hash_int: int, precision: int) -> Tuple[float, float]:
+    """Decode the integer bit pattern of a geohash into the coordinates of its cell center."""
+    interleaved = hash_int << (64 - precision * 5)
+    lat_int = _squash_bits(interleaved)
+    lng_int = _squash_bits(interleaved >> 1)
+    
+    return (
+        lat_int / _LAT_TO_INT - 90.0 + _LAT_ERR[precision],
+        lng_int / _LNG_TO_INT - 180.0 + _LNG_ERR[precision],
+    )
+
+
+def _int_to_geohash(hash_int: int, precision: int) -> str:
+    """Format the integer bit pattern of a geohash as a base32 string."""
+    return "".join([_BASE32_CHARS[(hash_int >> shift) & 0x1F] for shift in range(precision * 5 - 5, -1, -5)])
+
+
+def _geohash_to_int(geohash: str) -> int:
+    """Parse a base32 geohash string into its integer bit pattern."""
+    # int() would also accept non-ASCII digits, so only hand it ASCII input
+    if geohash.isascii():
+        try:
+            return int(geohash.translate(_BASE32_TO_INT_DIGITS), 32)
+        except ValueError:
+            pass
+    
+    invalid = next((char for char in geohash if char.lower() not in _BASE32_CHARS), "")
+    raise ValueError(f"Invalid geohash character '{invalid}' in '{geohash}'")
+
+
 def encode_geohash(latitude: float, longitude: float, precision: int = 10) -> str:
     """
-    Encode latitude and longitude into a geohash string using pygeohash library.
+    Encode latitude and longitude into a geohash string.
+    
+    Both coordinates are quantized to 32-bit integers and their bits are
+    interleaved (longitude first) into a single 64-bit integer, whose top
+    5 * precision bits are the geohash.
     
     Args:
         latitude: Latitude coordinate (-90 to 90)
@@ -64,41 +240,39 @@ def encode_geohash(latitude: float, longitude: float, precision: int = 10) -> st
     Raises:
         ValueError: If coordinates are out of valid range
     """
-    if not (-90 <= latitude <= 90):
-        raise ValueError(f"Latitude must be between -90 and 90, got {latitude}")
-    if not (-180 <= longitude <= 180):
-        raise ValueError(f"Longitude must be between -180 and 180, got {longitude}")
-    if not (1 <= precision <= 12):
+    # Single check on the common path; NaN fails every comparison
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180 and 1 <= precision <= 12):
+        if not (-90 <= latitude <= 90):
+            raise ValueError(f"Latitude must be between -90 and 90, got {latitude}")
+        if not (-180 <= longitude <= 180):
+            raise ValueError(f"Longitude must be between -180 and 180, got {longitude}")
         raise ValueError(f"Precision must be between 1 and 12, got {precision}")
     
-    return pgh.encode(latitude, longitude, precision=precision)
+    return _int_to_geohash(_encode_int(latitude, longitude, precision * 5), precision)
 
 
-def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+def decode_geohash(geohash: str) -> Tuple[float, float]:
     """
-    Calculate the distance between two points using pygeohash's haversine distance.
+    Decode a geohash string into the coordinates of its cell center.
     
     Args:
-        lat1, lng1: First point coordinates
-        lat2, lng2: Second point coordinates
+        geohash: Geohash string (1-12 characters)
         
     Returns:
-        Distance in meters
+        Tuple of (latitude, longitude) of the cell center
+        
+    Raises:
+        ValueError: If the geohash is empty, too long or contains invalid characters
     """
-    try:
-        # Convert coordinates to geohashes first, then use pygeohash distance
-        geohash1 = pgh.encode(lat1, lng1, precision=10)
-        geohash2 = pgh.encode(lat2, lng2, precision=10)
-        return pgh.geohash_haversine_distance(geohash1, geohash2)
-    except Exception as e:
-        # Fallback to manual Haversine calculation if pygeohash fails
-        print(f"Warning: pygeohash distance calculation failed: {e}, using fallback")
-        return _calculate_distance_haversine(lat1, lng1, lat2, lng2)
+    if not (1 <= len(geohash) <= 12):
+        raise ValueError(f"Geohash length must be between 1 and 12, got {len(geohash)}")
+    
+    return _decode_int(_geohash_to_int(geohash), len(geohash))
 
 
-def _calculate_distance_haversine(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     """
-    Fallback Haversine distance calculation.
+    Calculate the distance between two points using the Haversine formula.
     
     Args:
         lat1, lng1: First point coordinates
@@ -107,33 +281,112 @@ def _calculate_distance_haversine(lat1: float, lng1: float, lat2: float, lng2: f
     Returns:
         Distance in meters
     """
-    # Earth's radius in meters
-    R = 6371000
+    return _haversine_core(lat1, lng1, lat2, lng2)
+
+
+def _haversine_a(lat1_rad: float, cos_lat1: float, lat2_rad: float, dlng_rad: float) -> float:
+    """Haversine term `a` between two points, from radians and the first point's cosine."""
+    sin_dlat = math.sin((lat2_rad - lat1_rad) * 0.5)
+    sin_dlng = math.sin(dlng_rad * 0.5)
+    return sin_dlat * sin_dlat + cos_lat1 * math.cos(lat2_rad) * sin_dlng * sin_dlng
+
+
+def _haversine_core(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Haversine distance in meters between two points given in degrees."""
+    lat1_rad = lat1 * _DEG_TO_RAD
+    a = _haversine_a(lat1_rad, math.cos(lat1_rad), lat2 * _DEG_TO_RAD, (lng2 - lng1) * _DEG_TO_RAD)
+    return _EARTH_DIAMETER_METERS * math.asin(math.sqrt(a))
+
+
+class HaversineContext:
+    """
+    Haversine distances from a fixed center point.
     
-    # Convert to radians
-    lat1_rad = math.radians(lat1)
-    lng1_rad = math.radians(lng1)
-    lat2_rad = math.radians(lat2)
-    lng2_rad = math.radians(lng2)
+    The center's radians and cosine are computed once, so each distance only
+    needs the trigonometry of the other point.
+    """
+    
+    __slots__ = ("center_lat_rad", "center_lng_rad", "cos_center_lat")
+    
+    def __init__(self, center_lat: float, center_lng: float):
+        """Precompute the center terms of the Haversine formula."""
+        self.center_lat_rad = center_lat * _DEG_TO_RAD
+        self.center_lng_rad = center_lng * _DEG_TO_RAD
+        self.cos_center_lat = math.cos(self.center_lat_rad)
+    
+    def haversine_term(self, lat: float, lng: float) -> float:
+        """Haversine term `a` between the center and a point."""
+        return _haversine_a(
+            self.center_lat_rad, self.cos_center_lat, lat * _DEG_TO_RAD, lng * _DEG_TO_RAD - self.center_lng_rad
+        )
+    
+    def distances_to(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """Distances in meters between the center and many points."""
+        # Work in place on three buffers instead of allocating a temporary per operation
+        lats_rad = np.radians(lats)
+        
+        # sin²(dlat / 2), accumulated into the result buffer
+        a = lats_rad - self.center_lat_rad
+        a *= 0.5
+        np.sin(a, out=a)
+        a *= a
+        
+        # sin²(dlng / 2)
+        half_dlng = np.radians(lngs)
+        half_dlng -= self.center_lng_rad
+        half_dlng *= 0.5
+        np.sin(half_dlng, out=half_dlng)
+        half_dlng *= half_dlng
+        
+        # cos(center_lat) * cos(lat) * sin²(dlng / 2), reusing the latitude buffer
+        np.cos(lats_rad, out=lats_rad)
+        lats_rad *= self.cos_center_lat
+        lats_rad *= half_dlng
+        a += lats_rad
+        
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= _EARTH_DIAMETER_METERS
+        return a
+
+
+def _haversine_threshold(radius_meters: float) -> float:
+    """
+    Largest Haversine term `a` whose distance is still within radius_meters.
     
-    # Calculate differences
-    dlat = lat2_rad - lat1_rad
-    dlng = lng2_rad - lng1_rad
+    Since distance = 2 * R * asin(sqrt(a)) is monotonic in `a`, comparing `a`
+    against this threshold is equivalent to comparing distances.
+    """
+    half_angle = min(radius_meters / (2 * EARTH_RADIUS_METERS), math.pi / 2)
+    return math.sin(half_angle) ** 2
+
+
+def calculate_distance_bulk(lat0: float, lng0: float, lats, lngs) -> np.ndarray:
+    """
+    Calculate the distances from one point to many points at once.
     
-    # Haversine formula
-    a = (math.sin(dlat / 2) ** 2 + 
-         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng / 2) ** 2)
-    c = 2 * math.asin(math.sqrt(a))
+    Vectorized counterpart of calculate_distance for filtering candidate
+    events, e.g. with `mask = distances <= radius_meters`.
     
-    return R * c
+    Args:
+        lat0, lng0: Center point coordinates
+        lats: Latitudes of the other points (sequence or array)
+        lngs: Longitudes of the other points (sequence or array)
+        
+    Returns:
+        Array of distances in meters, one per point
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+    return HaversineContext(lat0, lng0).distances_to(lats, lngs)
 
 
 def get_geohash_query_bounds(center_lat: float, center_lng: float, radius_meters: float) -> list:
     """
-    Get geohash query bounds for a circular area search using pygeohash library.
+    Get geohash query bounds for a circular area search.
     
-    This implementation uses pygeohash's built-in functions to efficiently
-    calculate geohash bounds for circular area searches.
+    Enumerates the geohash cells covering the circle's bounding box by their
+    integer row and column, keeping only the cells that overlap the circle.
     
     Args:
         center_lat: Center latitude
@@ -143,114 +396,203 @@ def get_geohash_query_bounds(center_lat: float, center_lng: float, radius_meters
     Returns:
         List of geohash bounds for querying, each with 'startHash' and 'endHash'
     """
+    # Cells narrow with latitude, so size them against the radius in longitude
+    # degrees to avoid emitting many tiny cells away from the equator
+    effective_radius = radius_meters / max(0.1, math.cos(math.radians(center_lat)))
+    
     # Determine appropriate precision based on radius
     # Use a coarser precision to ensure we capture all relevant geohashes
-    if radius_meters > 1000000:  # > 1000km
-        precision = 3
-    elif radius_meters > 100000:  # > 100km
-        precision = 4
-    elif radius_meters > 10000:   # > 10km
-        precision = 4  # Use precision 4 for 10km+ to ensure we capture all geohashes
-    elif radius_meters > 1000:    # > 1km
-        precision = 5
-    elif radius_meters > 100:     # > 100m
-        precision = 6
+    precision = _RADIUS_PRECISIONS[bisect_left(_RADIUS_BREAKS, effective_radius)]
+    
+    # Nearby queries share a cache entry by quantizing the inputs to integer keys
+    lat_key = round(center_lat / _BOUNDS_DEGREE_STEP)
+    lng_key = round(center_lng / _BOUNDS_DEGREE_STEP)
+    radius_key = math.ceil(radius_meters / _BOUNDS_RADIUS_STEP)
+    
+    # Only small cell sets are cached; large radii are rare and would pin
+    # hundreds of KB per entry
+    first_row, last_row, first_col, last_col = _cell_grid_span(
+        lat_key * _BOUNDS_DEGREE_STEP,
+        lng_key * _BOUNDS_DEGREE_STEP,
+        radius_key * _BOUNDS_RADIUS_STEP + _BOUNDS_CENTER_PAD,
+        precision,
+    )
+    if (last_row - first_row + 1) * (last_col - first_col + 1) <= _BOUNDS_CACHE_MAX_CELLS:
+        cells = _bounds_cached(lat_key, lng_key, radius_key, precision)
     else:
-        precision = 7
+        cells = _compute_bounds(lat_key, lng_key, radius_key, precision)
     
-    # Calculate bounding box for the circular area
-    # Convert radius from meters to degrees (approximate)
-    lat_radius = radius_meters / 111000  # 111000m per degree latitude
-    lng_radius = radius_meters / (111000 * math.cos(math.radians(center_lat)))  # Adjust for longitude
-    
-    # Create bounding box
+    return [
+        {"startHash": start_hash, "endHash": end_hash}
+        for start_hash, end_hash in cells
+    ]
+
+
+def _cell_grid_span(center_lat: float, center_lng: float, radius_meters: float, precision: int) -> Tuple[int, int, int, int]:
+    """Return the (first_row, last_row, first_col, last_col) geohash cells covering the circle's bounding box."""
+    # Calculate bounding box for the circular area on the sphere
+    angular_radius = radius_meters / EARTH_RADIUS_METERS
+    lat_radius = math.degrees(angular_radius)
     min_lat = center_lat - lat_radius
     max_lat = center_lat + lat_radius
-    min_lng = center_lng - lng_radius
-    max_lng = center_lng + lng_radius
     
-    # Use pygeohash to get all geohashes in the bounding box
-    try:
-        # Create BoundingBox object
-        bbox = pgh.BoundingBox(min_lat, min_lng, max_lat, max_lng)
-        geohashes = pgh.geohashes_in_box(bbox, precision=precision)
-    except Exception as e:
-        # Fallback to manual calculation if pygeohash fails
-        print(f"Warning: pygeohash.geohashes_in_box failed: {e}, using fallback")
-        return _get_geohash_query_bounds_fallback(center_lat, center_lng, radius_meters, precision)
-    
-    # Filter geohashes to only include those within the actual radius
-    filtered_geohashes = []
-    for geohash in geohashes:
-        # Get the center of this geohash
-        geohash_lat, geohash_lng = pgh.decode(geohash)
-        
-        # Calculate distance from center
-        distance = calculate_distance(center_lat, center_lng, geohash_lat, geohash_lng)
-        
-        # Only include if within radius
-        if distance <= radius_meters:
-            filtered_geohashes.append(geohash)
-    
-    # Convert to bounds format - use prefix matching for better coverage
+    # Cell grid at this precision; longitude takes the extra bit when the bit count is odd
+    lat_cells = 1 << (precision * 5 // 2)
+    lng_cells = 1 << (precision * 5 - precision * 5 // 2)
+    lat_cell_size = 180.0 / lat_cells
+    lng_cell_size = 360.0 / lng_cells
+    
+    # Rows clamp at the poles
+    first_row = max(0, int((min_lat + 90.0) // lat_cell_size))
+    last_row = min(lat_cells - 1, int((max_lat + 90.0) // lat_cell_size))
+    
+    # A circle reaching a pole spans every longitude; otherwise its widest
+    # longitude extent is asin(sin(r) / cos(lat)) around the center
+    if max_lat >= 90.0 or min_lat <= -90.0:
+        return first_row, last_row, 0, lng_cells - 1
+    
+    sin_lng_radius = math.sin(angular_radius) / math.cos(math.radians(center_lat))
+    lng_radius = math.degrees(math.asin(min(1.0, sin_lng_radius)))
+    
+    # Columns may run past the antimeridian and wrap around, but never cover
+    # more than the full circle of longitude
+    first_col = int((center_lng - lng_radius + 180.0) // lng_cell_size)
+    last_col = int((center_lng + lng_radius + 180.0) // lng_cell_size)
+    if last_col - first_col >= lng_cells:
+        return first_row, last_row, 0, lng_cells - 1
+    return first_row, last_row, first_col, last_col
+
+
+def _compute_bounds(lat_key: int, lng_key: int, radius_key: int, precision: int) -> Tuple[Tuple[str, str], ...]:
+    """Compute query bounds for quantized inputs as hashable (startHash, endHash) tuples."""
+    center_lat = lat_key * _BOUNDS_DEGREE_STEP
+    center_lng = lng_key * _BOUNDS_DEGREE_STEP
+    radius_meters = radius_key * _BOUNDS_RADIUS_STEP + _BOUNDS_CENTER_PAD
+    
+    first_row, last_row, first_col, last_col = _cell_grid_span(center_lat, center_lng, radius_meters, precision)
+    lat_cells = 1 << (precision * 5 // 2)
+    lng_cells = 1 << (precision * 5 - precision * 5 // 2)
+    lat_cell_size = 180.0 / lat_cells
+    lng_cell_size = 360.0 / lng_cells
+    
+    # Center terms of the Haversine formula are the same for every geohash
+    haversine = HaversineContext(center_lat, center_lng)
+    
+    # A cell overlaps the circle when its center is within the radius plus the
+    # cell's half diagonal; testing centers alone drops cells larger than the radius
+    cell_half_diagonal = math.hypot(_LAT_ERR[precision], _LNG_ERR[precision]) * _METERS_PER_DEGREE
+    
+    # Compare the Haversine term directly against the radius, skipping asin/sqrt
+    max_a = _haversine_threshold(radius_meters + cell_half_diagonal)
+    
+    # Row and column are the de-interleaved geohash bits, so each cell's hash is
+    # their interleaving; longitude holds the top bit, so with an odd bit count
+    # it takes the even positions
+    lat_shift = (precision * 5) & 1
+    lng_shift = 1 - lat_shift
+    col_hash_bits = [(_spread_bits(col % lng_cells) << lng_shift) for col in range(first_col, last_col + 1)]
+    
+    # Filter cells to only include those overlapping the actual radius
     bounds = []
-    for geohash in filtered_geohashes:
-        bounds.append({
-            "startHash": geohash,
-            "endHash": geohash + "~"  # ~ is the last character in base32
-        })
+    for row in range(first_row, last_row + 1):
+        cell_lat = (row + 0.5) * lat_cell_size - 90.0
+        row_hash_bits = _spread_bits(row) << lat_shift
+        
+        for col, col_bits in zip(range(first_col, last_col + 1), col_hash_bits):
+            cell_lng = (col % lng_cells + 0.5) * lng_cell_size - 180.0
+            
+            # Only include if the cell can reach into the radius
+            if haversine.haversine_term(cell_lat, cell_lng) > max_a:
+                continue
+            
+            # Use prefix matching for better coverage (~ is the last character in base32)
+            geohash = _int_to_geohash(row_hash_bits | col_bits, precision)
+            bounds.append((geohash, geohash + "~"))
     
-    return bounds
+    return tuple(bounds)
+
 
+# Each cached cell costs about 160 bytes, so an entry is at most ~42 KB and a
+# full cache at most ~11 MB
+_bounds_cached = lru_cache(maxsize=_BOUNDS_CACHE_SIZE)(_compute_bounds)
 
-def _get_geohash_query_bounds_fallback(center_lat: float, center_lng: float, radius_meters: float, precision: int) -> list:
+
+def geohash_prefix_fields(geohash: str) -> Dict[str, str]:
     """
-    Fallback implementation for geohash query bounds calculation.
+    Build the geohash prefix fields stored on event documents alongside the full geohash.
     
-    This is used when pygeohash.geohashes_in_box fails.
+    Args:
+        geohash: Full-precision geohash of the event
+        
+    Returns:
+        Dict mapping geohash_prefix_{precision} field names to geohash prefixes
     """
-    # Get center geohash
-    center_geohash = encode_geohash(center_lat, center_lng, precision)
+    return {f"geohash_prefix_{precision}": geohash[:precision] for precision in GEOHASH_PREFIX_PRECISIONS}
+
+
+def _get_event_coordinates(data: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    """Extract (latitude, longitude) from an event's position field, or None if unusable."""
+    position = data.get("position")
+    if not position:
+        return None
+    
+    # Handle different position formats
+    if hasattr(position, 'latitude') and hasattr(position, 'longitude'):
+        # Firebase GeoPoint object
+        event_lat = position.latitude
+        event_lng = position.longitude
+    elif isinstance(position, dict):
+        # Dictionary with lat/lng or latitude/longitude keys
+        event_lat = position.get('latitude') or position.get('lat')
+        event_lng = position.get('longitude') or position.get('lng')
+    else:
+        return None
     
-    # Calculate geohash cell dimensions for this precision
-    lat_error = 90.0 / (2 ** (precision * 5 // 2))
-    lng_error = 180.0 / (2 ** ((precision * 5 + 1) // 2))
+    if event_lat is None or event_lng is None:
+        return None
     
-    # Calculate how many geohash cells we need to cover the radius
-    lat_cells = max(1, int(radius_meters / (lat_error * 111000)))  # 111000m per degree lat
-    lng_cells = max(1, int(radius_meters / (lng_error * 111000 * math.cos(math.radians(center_lat)))))
+    # Reject non-numeric coordinates here so one bad document cannot fail the
+    # vectorized filter for the whole search
+    try:
+        return float(event_lat), float(event_lng)
+    except (TypeError, ValueError):
+        return None
+
+
+def _finalize_doc(data: Dict[str, Any], doc_id: str, distance_m: float) -> Dict[str, Any]:
+    """
+    Build the JSON-serializable search result for an event document.
     
-    bounds = []
+    Only the required fields (name, date, address, cover) are kept and
+    converted, so the rest of the document is never walked.
     
-    # Generate bounds by expanding around the center geohash
-    for lat_offset in range(-lat_cells, lat_cells + 1):
-        for lng_offset in range(-lng_cells, lng_cells + 1):
-            # Calculate offset coordinates
-            offset_lat = center_lat + (lat_offset * lat_error)
-            offset_lng = center_lng + (lng_offset * lng_error)
-            
-            # Check if this offset is within the radius
-            distance = calculate_distance(center_lat, center_lng, offset_lat, offset_lng)
-            if distance <= radius_meters:
-                # Generate geohash for this offset
-                offset_geohash = encode_geohash(offset_lat, offset_lng, precision)
-                
-                # Add bounds for this geohash
-                bounds.append({
-                    "startHash": offset_geohash,
-                    "endHash": offset_geohash + "~"  # ~ is the last character in base32
-                })
-    
-    # Remove duplicates and sort
-    unique_bounds = []
-    seen = set()
-    for bound in bounds:
-        key = (bound["startHash"], bound["endHash"])
-        if key not in seen:
-            seen.add(key)
-            unique_bounds.append(bound)
-    
-    return unique_bounds
+    Args:
+        data: Event document data
+        doc_id: Event document ID
+        distance_m: Distance from the search center in meters
+        
+    Returns:
+        Search result with the required fields, `_distance_meters` and `_doc_id`
+    """
+    result = {}
+    
+    if 'name' in data:
+        result['name'] = _convert_firestore_to_json_serializable(data['name'])
+    if 'date' in data:
+        result['date'] = _convert_firestore_to_json_serializable(data['date'])
+    elif 'startDate' in data:
+        # Use startDate as date if date field doesn't exist
+        result['date'] = _convert_firestore_to_json_serializable(data['startDate'])
+    if 'address' in data:
+        result['address'] = _convert_firestore_to_json_serializable(data['address'])
+    if 'cover' in data:
+        result['cover'] = _convert_firestore_to_json_serializable(data['cover'])
+    
+    # Add distance and doc_id for convenience
+    result['_distance_meters'] = round(distance_m, 2)
+    result['_doc_id'] = doc_id
+    
+    return result
 
 
 def query_events_by_radius(
@@ -258,7 +600,8 @@ def query_events_by_radius(
     center_lat: float, 
     center_lng: float, 
     radius_meters: float,
-    collection_name: str = "events"
+    collection_name: str = "events",
+    use_prefix_fields: bool = False
 ) -> list:
     """
     Query events within a specified radius using geohash bounds.
@@ -272,12 +615,15 @@ def query_events_by_radius(
         center_lng: Center longitude
         radius_meters: Search radius in meters
         collection_name: Name of the Firestore collection to query
+        use_prefix_fields: Match cells with "in" filters on the geohash_prefix_{precision}
+            fields instead of one range query per cell; every event document must
+            carry these fields
         
     Returns:
         List of event documents within the specified radius
     """
     from concurrent.futures import ThreadPoolExecutor, as_completed
-    from typing import List, Dict, Any
+    from typing import List
     
     # Get geohash query bounds
     bounds = get_geohash_query_bounds(center_lat, center_lng, radius_meters)
@@ -285,91 +631,95 @@ def query_events_by_radius(
     if not bounds:
         return []
     
-    # Execute queries for each bound
-    all_docs = []
-    
-    def execute_query(bound: Dict[str, str]) -> List[Any]:
-        """Execute a single geohash range query."""
+    # Cheap latitude band reject, applied while streaming before any trigonometry
+    lat_delta = math.degrees(radius_meters / EARTH_RADIUS_METERS)
+    
+    # Each query is (query, description) for error logging
+    collection = db.collection(collection_name)
+    precision = len(bounds[0]["startHash"])
+    if use_prefix_fields and precision in GEOHASH_PREFIX_PRECISIONS:
+        # Match whole cells by their exact prefix, turning one range scan per
+        # cell into one "in" query per batch of cells
+        prefix_field = f"geohash_prefix_{precision}"
+        prefixes = [bound["startHash"] for bound in bounds]
+        queries = [
+            (collection.where(prefix_field, "in", prefixes[start:start + _IN_QUERY_MAX_VALUES]),
+             prefixes[start:start + _IN_QUERY_MAX_VALUES])
+            for start in range(0, len(prefixes), _IN_QUERY_MAX_VALUES)
+        ]
+    else:
+        queries = [
+            (collection.where("geohash", ">=", bound["startHash"]).where("geohash", "<=", bound["endHash"]), bound)
+            for bound in bounds
+        ]
+    
+    def execute_query(query, description: Any) -> Tuple[List[str], List[Dict[str, Any]], List[float], List[float]]:
+        """
+        Stream a single geohash query, keeping only candidates with usable coordinates.
+        
+        Candidates are returned column-wise as (doc_ids, docs, lats, lngs).
+        """
+        doc_ids, docs, lats, lngs = [], [], [], []
+        
         try:
-            query = (db.collection(collection_name)
-                    .where("geohash", ">=", bound["startHash"])
-                    .where("geohash", "<=", bound["endHash"]))
-            
-            docs = list(query.stream())
-            return docs
+            for doc in query.stream():
+                try:
+                    data = doc.to_dict()
+                    coordinates = _get_event_coordinates(data)
+                    if coordinates is None:
+                        continue
+                    
+                    event_lat, event_lng = coordinates
+                    if abs(event_lat - center_lat) > lat_delta:
+                        continue
+                    
+                    doc_ids.append(doc.id)
+                    docs.append(data)
+                    lats.append(event_lat)
+                    lngs.append(event_lng)
+                    
+                except Exception as e:
+                    logger.warning("Error processing document %s: %s", doc.id, e)
+                    continue
         except Exception as e:
-            print(f"Error executing query for bound {bound}: {e}")
-            return []
-    
-    # Execute all queries in parallel
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        future_to_bound = {executor.submit(execute_query, bound): bound for bound in bounds}
+            logger.error("Error executing query for %s: %s", description, e)
         
-        for future in as_completed(future_to_bound.keys()):
-            docs = future.result()
-            all_docs.extend(docs)
-    
-    # Filter out false positives by calculating actual distance
-    matching_events = []
-    
-    for doc in all_docs:
-        try:
-            data = doc.to_dict()
-            
-            # Extract coordinates from the document
-            position = data.get("position")
-            if not position:
-                continue
-                
-            # Handle different position formats
-            if hasattr(position, 'latitude') and hasattr(position, 'longitude'):
-                # Firebase GeoPoint object
-                event_lat = position.latitude
-                event_lng = position.longitude
-            elif isinstance(position, dict):
-                # Dictionary with lat/lng or latitude/longitude keys
-                event_lat = position.get('latitude') or position.get('lat')
-                event_lng = position.get('longitude') or position.get('lng')
-            else:
-                continue
-                
-            if event_lat is None or event_lng is None:
+        return doc_ids, docs, lats, lngs
+    
+    # Execute all queries in parallel; workers only wait on Firestore RPCs,
+    # so one per query lets every query run in a single round-trip
+    doc_ids, docs = [], []
+    lat_chunks, lng_chunks = [], []
+    with ThreadPoolExecutor(max_workers=min(32, len(queries))) as executor:
+        futures = [executor.submit(execute_query, *query) for query in queries]
+        
+        for future in as_completed(futures):
+            bound_ids, bound_docs, bound_lats, bound_lngs = future.result()
+            if not bound_ids:
                 continue
             
-            # Calculate actual distance
-            distance = calculate_distance(center_lat, center_lng, event_lat, event_lng)
-            
-            # Only include if within radius
-            if distance <= radius_meters:
-                # Filter to only include required fields: name, date, address, cover
-                filtered_data = {}
-                
-                # Add required fields if they exist
-                if 'name' in data:
-                    filtered_data['name'] = data['name']
-                if 'date' in data:
-                    filtered_data['date'] = data['date']
-                elif 'startDate' in data:
-                    # Use startDate as date if date field doesn't exist
-                    filtered_data['date'] = data['startDate']
-                if 'address' in data:
-                    filtered_data['address'] = data['address']
-                if 'cover' in data:
-                    filtered_data['cover'] = data['cover']
-                
-                # Add distance and doc_id for convenience
-                filtered_data['_distance_meters'] = round(distance, 2)
-                filtered_data['_doc_id'] = doc.id
-                
-                # Convert Firestore data types to JSON-serializable format
-                filtered_data = _convert_firestore_to_json_serializable(filtered_data)
-                matching_events.append(filtered_data)
-                
-        except Exception as e:
-            print(f"Error processing document {doc.id}: {e}")
-            continue
+            # Collect coordinates into contiguous per-bound arrays
+            doc_ids.extend(bound_ids)
+            docs.extend(bound_docs)
+            lat_chunks.append(np.fromiter(bound_lats, dtype=np.float64, count=len(bound_lats)))
+            lng_chunks.append(np.fromiter(bound_lngs, dtype=np.float64, count=len(bound_lngs)))
+    
+    if not doc_ids:
+        return []
+    
+    lats = np.concatenate(lat_chunks)
+    lngs = np.concatenate(lng_chunks)
+    
+    # Filter out false positives by their actual distance
+    distances = calculate_distance_bulk(center_lat, center_lng, lats, lngs)
+    near = np.flatnonzero(distances <= radius_meters)
+    distances = distances[near]
     
     # Sort by distance (closest first)
-    matching_events.sort(key=lambda x: x.get('_distance_meters', float('inf')))
+    order = np.argsort(distances, kind="stable")
+    
+    matching_events = []
+    for index, distance in zip(near[order].tolist(), distances[order].tolist()):
+        matching_events.append(_finalize_doc(docs[index], doc_ids[index], distance))
     
     return matching_events
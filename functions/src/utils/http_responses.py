@@ -1,9 +1,26 @@
 """HTTP response utilities for Firebase Functions."""
 
-import json
+import orjson
 from firebase_functions import https_fn
 from typing import Any, Dict, Optional
 
+# Keep json.dumps behaviour for non-string keys and allow NumPy values
+_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively, such as Firestore values."""
+    if hasattr(obj, 'isoformat'):
+        # Datetime subclasses like Firestore timestamps
+        return obj.isoformat()
+    if hasattr(obj, 'latitude') and hasattr(obj, 'longitude'):
+        # GeoPoint objects
+        return {"latitude": obj.latitude, "longitude": obj.longitude}
+    if hasattr(obj, 'path') and hasattr(obj, 'id'):
+        # DocumentReference objects
+        return {"_type": "DocumentReference", "id": obj.id, "path": obj.path}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
 def json_response(data: Any, status_code: int = 200) -> https_fn.Response:
     """
@@ -17,7 +34,7 @@ def json_response(data: Any, status_code: int = 200) -> https_fn.Response:
         Firebase Functions HTTP response with JSON content
     """
     return https_fn.Response(
-        json.dumps(data), 
+        orjson.dumps(data, default=_json_default, option=_JSON_OPTIONS), 
         status_code, 
         headers={"Content-Type": "application/json"}
     )
@@ -0,0 +1,95 @@
+"""Tests for event association fan-out in the event service."""
+
+import pytest
+from unittest.mock import Mock, MagicMock, patch
+
+from src.events.event_service import EventService, MAX_BATCH_WRITES
+
+
+def _document(doc_id, data):
+    """Build a query result document with its own reference mock."""
+    doc = Mock(id=doc_id)
+    doc.to_dict.return_value = dict(data)
+    doc.reference = Mock(name=f"ref_{doc_id}")
+    return doc
+
+
+@pytest.fixture
+def db():
+    """Firestore client mock whose association queries return per-collection documents."""
+    db = MagicMock()
+    db.results = {"event_survey_question": [], "event_media": []}
+    
+    def collection(name):
+        coll = MagicMock()
+        coll.where.return_value.stream.side_effect = lambda: iter(db.results[name])
+        return coll
+    
+    db.collection.side_effect = collection
+    return db
+
+
+@pytest.fixture
+def service(db):
+    """Event service backed by the Firestore mock and a mocked storage bucket."""
+    with patch("src.events.event_service.get_firestore_client", return_value=db), \
+            patch("src.events.event_service.storage"):
+        return EventService()
+
+
+class TestEventAssociations:
+    """Test batched reads and writes when duplicating and deleting associations."""
+    
+    def test_duplicate_event_associations_batches_writes(self, service, db):
+        """Test that events are read with one get_all and questions are written one batch per 500 docs."""
+        old_ref, new_ref = Mock(path="event/old"), Mock(path="event/new")
+        db.get_all.return_value = [
+            Mock(reference=old_ref, exists=True, **{"to_dict.return_value": {"name": "Old"}}),
+            Mock(reference=new_ref, exists=True, **{"to_dict.return_value": {"name": "New"}}),
+        ]
+        questions = [_document(f"q{index}", {"event": old_ref}) for index in range(MAX_BATCH_WRITES + 1)]
+        db.results["event_survey_question"] = questions
+        
+        result = service.duplicate_event_associations(old_ref, new_ref)
+        
+        assert result.status_code == 200
+        db.get_all.assert_called_once_with([old_ref, new_ref])
+        old_ref.get.assert_not_called()
+        assert db.batch.call_count == 2
+        assert db.batch.return_value.commit.call_count == 2
+        assert db.batch.return_value.set.call_count == MAX_BATCH_WRITES + 1
+        for question in questions:
+            question.reference.get.assert_not_called()
+    
+    def test_delete_event_associations_batches_deletes(self, service, db):
+        """Test that documents are deleted one batch per 500 docs instead of one by one."""
+        questions = [_document(f"q{index}", {}) for index in range(MAX_BATCH_WRITES + 1)]
+        db.results["event_survey_question"] = questions
+        
+        result = service.delete_event_associations(Mock(id="event"), {"name": "Event"})
+        
+        assert result.status_code == 200
+        assert db.batch.return_value.commit.call_count == 2
+        assert db.batch.return_value.delete.call_count == MAX_BATCH_WRITES + 1
+        for question in questions:
+            question.reference.delete.assert_not_called()
+            question.reference.get.assert_not_called()
+    
+    def test_delete_media_keeps_document_when_file_step_raises(self, service, db):
+        """Test that a media document is kept when deleting its file raised."""
+        kept = _document("kept", {"path": "https://storage/o/kept.png"})
+        deleted = _document("deleted", {"path": "https://storage/o/deleted.png"})
+        db.results["event_media"] = [kept, deleted]
+        service._delete_media_file = Mock(side_effect=[RuntimeError("storage down"), True])
+        
+        assert service._delete_media(Mock()) == 1
+        
+        db.batch.return_value.delete.assert_called_once_with(deleted.reference)
+    
+    def test_delete_documents_counts_committed_batches(self, service, db):
+        """Test that batches committed before a failing one are still counted."""
+        db.batch.return_value.commit.side_effect = [None, RuntimeError("unavailable")]
+        
+        refs = [Mock() for _ in range(MAX_BATCH_WRITES + 1)]
+        
+        assert service._delete_documents(refs) == MAX_BATCH_WRITES
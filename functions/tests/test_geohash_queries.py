@@ -9,7 +9,10 @@ from src.utils.geohash import (
     get_geohash_query_bounds,
     query_events_by_radius,
     calculate_distance,
-    encode_geohash
+    encode_geohash,
+    decode_geohash,
+    calculate_distance_bulk,
+    _bounds_cached
 )
 from src.events.event_service import search_events_by_radius
 from firebase_functions import https_fn
@@ -71,6 +74,79 @@ class TestGeohashQueryBounds:
                 # Check that geohash length matches expected precision
                 geohash_length = len(bounds[0]["startHash"])
                 assert geohash_length == expected_precision, f"Radius {radius}m should use precision {expected_precision}, got {geohash_length}"
+    
+    def test_get_geohash_query_bounds_precision_scales_with_latitude(self):
+        """Test that cells get coarser at high latitudes for the same radius."""
+        radius_meters = 500
+        
+        equator_bounds = get_geohash_query_bounds(0.0, 9.1900, radius_meters)
+        polar_bounds = get_geohash_query_bounds(70.0, 9.1900, radius_meters)
+        
+        assert len(equator_bounds[0]["startHash"]) == 6
+        assert len(polar_bounds[0]["startHash"]) == 5
+    
+    def test_get_geohash_query_bounds_includes_cell_reached_at_corner(self):
+        """Test that a cell is kept when the circle only reaches its far corner."""
+        # South-west corner of cell s2n1, and a center 49,999m away from it,
+        # diagonally away from the cell center
+        corner_lat, corner_lng = 0.17578125, 19.6875
+        center_lat, center_lng = -0.025315238591796876, 19.28532168482073
+        radius_meters = 50000
+        
+        assert encode_geohash(0.3, 20.0, precision=4) == "s2n1"
+        assert calculate_distance(center_lat, center_lng, corner_lat, corner_lng) < radius_meters
+        
+        bounds = get_geohash_query_bounds(center_lat, center_lng, radius_meters)
+        
+        assert "s2n1" in {bound["startHash"] for bound in bounds}
+    
+    def test_get_geohash_query_bounds_caches_only_small_cell_sets(self):
+        """Test that bounds spanning many cells are recomputed instead of cached."""
+        _bounds_cached.cache_clear()
+        
+        get_geohash_query_bounds(45.4642, 9.1900, 1000)
+        assert _bounds_cached.cache_info().currsize == 1
+        
+        large_bounds = get_geohash_query_bounds(30.0, 9.1900, 700000)
+        assert len(large_bounds) > 256
+        assert _bounds_cached.cache_info().currsize == 1
+
+
+class TestGeohashEncoding:
+    """Test geohash encoding and decoding."""
+    
+    def test_encode_geohash_known_values(self):
+        """Test encoding against well-known geohashes."""
+        assert encode_geohash(42.6, -5.6, precision=5) == "ezs42"
+        assert encode_geohash(57.64911, 10.40744, precision=11) == "u4pruydqqvj"
+    
+    def test_encode_geohash_extremes(self):
+        """Test encoding at the edges of the coordinate space."""
+        assert encode_geohash(-90.0, -180.0, precision=12) == "000000000000"
+        assert encode_geohash(90.0, 180.0, precision=12) == "zzzzzzzzzzzz"
+    
+    def test_decode_geohash_returns_cell_center(self):
+        """Test that decoding returns a point inside the encoded cell."""
+        lat, lng = 45.4642, 9.1900
+        
+        for precision in range(1, 13):
+            geohash = encode_geohash(lat, lng, precision=precision)
+            decoded_lat, decoded_lng = decode_geohash(geohash)
+            
+            assert encode_geohash(decoded_lat, decoded_lng, precision=precision) == geohash
+            assert abs(decoded_lat - lat) <= 90.0 / (2 ** (precision * 5 // 2))
+            assert abs(decoded_lng - lng) <= 180.0 / (2 ** ((precision * 5 + 1) // 2))
+    
+    def test_decode_geohash_invalid(self):
+        """Test that invalid geohashes are rejected."""
+        with pytest.raises(ValueError):
+            decode_geohash("")
+        with pytest.raises(ValueError):
+            decode_geohash("u0nda")  # 'a' is not part of the geohash alphabet
+    
+    def test_decode_geohash_case_insensitive(self):
+        """Test that upper-case geohashes decode like lower-case ones."""
+        assert decode_geohash("EZS42") == decode_geohash("ezs42")
 
 
 class TestDistanceCalculation:
@@ -106,6 +182,106 @@ class TestDistanceCalculation:
         
         # Should be approximately 111km (111000m) with some tolerance
         assert 110000 <= distance <= 112000
+    
+    def test_calculate_distance_bulk_matches_scalar(self):
+        """Test that the vectorized distance matches the scalar one."""
+        center_lat, center_lng = 45.4642, 9.1900
+        lats = [45.4642, 41.9028, 0.0, -33.9249]
+        lngs = [9.1900, 12.4964, 0.0, 18.4241]
+        
+        distances = calculate_distance_bulk(center_lat, center_lng, lats, lngs)
+        
+        assert len(distances) == len(lats)
+        for distance, lat, lng in zip(distances, lats, lngs):
+            assert abs(distance - calculate_distance(center_lat, center_lng, lat, lng)) < 10.0
+
+
+class TestQueryEventsByRadius:
+    """Test querying events through geohash bounds."""
+    
+    def _mock_db(self):
+        """Build a Firestore client mock whose first query returns a near and a far event."""
+        near = Mock(id="near")
+        near.to_dict.return_value = {"name": "Near", "position": {"latitude": 45.001, "longitude": 9.0}}
+        far = Mock(id="far")
+        far.to_dict.return_value = {"name": "Far", "position": {"latitude": 45.02, "longitude": 9.0}}
+        
+        db = MagicMock()
+        collection = db.collection.return_value
+        query = MagicMock()
+        query.where.return_value = query
+        query.stream.side_effect = [[near, far]] + [[]] * 1000
+        collection.where.return_value = query
+        return db, collection
+    
+    def test_query_events_by_radius_range_queries(self):
+        """Test that cells are matched with geohash range queries by default."""
+        db, collection = self._mock_db()
+        bounds = get_geohash_query_bounds(45.0, 9.0, 500)
+        
+        events = query_events_by_radius(db, 45.0, 9.0, 500)
+        
+        assert [event["_doc_id"] for event in events] == ["near"]
+        assert collection.where.call_count == len(bounds)
+        assert {call.args[:2] for call in collection.where.call_args_list} == {("geohash", ">=")}
+    
+    def test_query_events_by_radius_skips_non_numeric_coordinates(self):
+        """Test that an event with non-numeric coordinates is skipped without failing the search."""
+        good = Mock(id="good")
+        good.to_dict.return_value = {"name": "Good", "position": {"latitude": 45.4642, "longitude": 9.19}}
+        bad = Mock(id="bad")
+        bad.to_dict.return_value = {"name": "Bad", "position": {"latitude": "n/a", "longitude": 9.19}}
+        
+        db = MagicMock()
+        query = MagicMock()
+        query.where.return_value = query
+        query.stream.side_effect = lambda: iter([good, bad])
+        db.collection.return_value.where.return_value = query
+        
+        events = query_events_by_radius(db, 45.4642, 9.19, 100000)
+        
+        assert {event["_doc_id"] for event in events} == {"good"}
+    
+    def test_query_events_by_radius_filters_stale_geohash(self):
+        """Test that an event is dropped when its stored geohash is inside the radius but its position is not."""
+        center_lat, center_lng = 45.4642, 9.19  # Milan
+        radius_meters = 100000
+        
+        # The stored geohash still points at Milan, but the event moved to Rome
+        moved = Mock(id="moved")
+        moved.to_dict.return_value = {
+            "name": "Moved",
+            "geohash": encode_geohash(center_lat, center_lng, precision=10),
+            "position": {"latitude": 41.9028, "longitude": 12.4964},
+        }
+        
+        db = MagicMock()
+        query = MagicMock()
+        query.where.return_value = query
+        query.stream.side_effect = lambda: iter([moved])
+        db.collection.return_value.where.return_value = query
+        
+        events = query_events_by_radius(db, center_lat, center_lng, radius_meters)
+        
+        assert events == []
+    
+    def test_query_events_by_radius_prefix_fields(self):
+        """Test that prefix queries match cells with "in" filters on the prefix field."""
+        db, collection = self._mock_db()
+        bounds = get_geohash_query_bounds(45.0, 9.0, 500)
+        precision = len(bounds[0]["startHash"])
+        
+        events = query_events_by_radius(db, 45.0, 9.0, 500, use_prefix_fields=True)
+        
+        assert [event["_doc_id"] for event in events] == ["near"]
+        queried_prefixes = set()
+        for call in collection.where.call_args_list:
+            field, operator, prefixes = call.args
+            assert (field, operator) == (f"geohash_prefix_{precision}", "in")
+            assert len(prefixes) <= 30
+            queried_prefixes.update(prefixes)
+        assert queried_prefixes == {bound["startHash"] for bound in bounds}
+
 
 class TestEventServiceSearch:
     """Test EventService search_events_by_radius method."""
@@ -208,25 +384,40 @@ class TestEventServiceSearch:
         assert len(response_data["events"]) == 2
 
 
+INTEGRATION_COORDS = [
+    (45.4642, 9.1900),  # Milan
+    (41.9028, 12.4964), # Rome
+    (0.0, 0.0),         # Equator/Prime Meridian
+    (-33.9249, 18.4241), # Cape Town
+]
+
+
+@pytest.fixture(scope="module")
+def encoded_coords():
+    """Encode the integration coordinates once for the whole module, keyed by coordinate."""
+    return {(lat, lng): encode_geohash(lat, lng, precision=10) for lat, lng in INTEGRATION_COORDS}
+
+
 class TestGeohashIntegration:
     """Integration tests for geohash functionality."""
     
-    def test_geohash_encoding_decoding_consistency(self):
+    @pytest.mark.parametrize("lat,lng", INTEGRATION_COORDS)
+    def test_geohash_encoding_decoding_consistency(self, lat, lng, encoded_coords):
         """Test that encoding and decoding are consistent."""
-        test_coords = [
-            (45.4642, 9.1900),  # Milan
-            (41.9028, 12.4964), # Rome
-            (0.0, 0.0),         # Equator/Prime Meridian
-            (-33.9249, 18.4241), # Cape Town
-        ]
+        geohash = encoded_coords[(lat, lng)]
         
-        for lat, lng in test_coords:
-            geohash = encode_geohash(lat, lng, precision=10)
-            decoded_lat, decoded_lng = geohash[:10], geohash[10:]  # This is a simplified test
-            
-            # The geohash should be a valid string
-            assert isinstance(geohash, str)
-            assert len(geohash) == 10
+        # The geohash should be a valid string
+        assert isinstance(geohash, str)
+        assert len(geohash) == 10
+        
+        # Decoding should land within the precision 10 cell (about 0.6m)
+        decoded_lat, decoded_lng = decode_geohash(geohash)
+        assert abs(decoded_lat - lat) < 1e-5
+        assert abs(decoded_lng - lng) < 1e-5
+        assert encode_geohash(decoded_lat, decoded_lng, precision=10) == geohash
+        
+        # Shorter geohashes are prefixes of longer ones
+        assert encode_geohash(lat, lng, precision=5) == geohash[:5]
     
     def test_distance_calculation_precision(self):
         """Test distance calculation precision."""
@@ -0,0 +1,123 @@
+"""Tests for the Firebase Functions triggers."""
+
+import pytest
+from unittest.mock import Mock, patch
+
+from firebase_functions import https_fn
+
+from src.config.settings import settings
+
+
+@pytest.fixture(scope="module")
+def on_user_created():
+    """Import the trigger module without requiring a configured environment."""
+    with patch.object(settings, "validate"):
+        from src.main import on_user_created as trigger
+    
+    # Call the handler directly instead of going through the CloudEvent wrapper
+    return trigger.__wrapped__
+
+
+@pytest.fixture(scope="module")
+def search_events_nearby():
+    """Import the HTTP endpoint without requiring a configured environment."""
+    with patch.object(settings, "validate"):
+        from src.main import search_events_nearby as endpoint
+    
+    return endpoint.__wrapped__
+
+
+def _user_event(fields, exists=True):
+    """Build a user-created event whose snapshot holds the given fields."""
+    snapshot = Mock()
+    snapshot.exists = exists
+    snapshot.to_dict.return_value = dict(fields)
+    
+    def get_field(field):
+        if field not in fields:
+            raise KeyError(field)
+        return fields[field]
+    
+    snapshot.get.side_effect = get_field
+    
+    event = Mock()
+    event.data = snapshot
+    return event
+
+
+class TestOnUserCreated:
+    """Test the on_user_created trigger."""
+    
+    def test_on_user_created_all_names_present(self, on_user_created):
+        """Test that a user with every name field is left unchanged."""
+        event = _user_event({"display_name": "Ada Lovelace", "firstName": "Ada", "lastName": "Lovelace"})
+        
+        result = on_user_created(event)
+        
+        assert result.status_code == 200
+        assert result.get_data(as_text=True) == "User name fields are complete"
+        event.data.reference.update.assert_not_called()
+    
+    def test_on_user_created_missing_document(self, on_user_created):
+        """Test that a snapshot without a document is rejected."""
+        event = _user_event({}, exists=False)
+        
+        result = on_user_created(event)
+        
+        assert result.status_code == 400
+        event.data.reference.update.assert_not_called()
+    
+    def test_on_user_created_splits_display_name(self, on_user_created):
+        """Test that missing first and last names are derived from display_name."""
+        event = _user_event({"display_name": "Ada Lovelace"})
+        
+        result = on_user_created(event)
+        
+        assert result.status_code == 200
+        event.data.reference.update.assert_called_once_with({"firstName": "Ada", "lastName": "Lovelace"})
+
+
+def _search_request(query_string):
+    """Build a GET request with a raw WSGI (latin-1) query string."""
+    return https_fn.Request.from_values(environ_overrides={"QUERY_STRING": query_string})
+
+
+class TestSearchEventsNearby:
+    """Test query parameter parsing in the search_events_nearby endpoint."""
+    
+    @patch("src.main.search_events_by_radius")
+    def test_search_events_nearby_reordered_parameters(self, mock_search, search_events_nearby):
+        """Test that parameters are read regardless of their order."""
+        req = _search_request("radius=1000&collection=events&lng=9.19&lat=45.46")
+        
+        search_events_nearby(req)
+        
+        mock_search.assert_called_once_with(45.46, 9.19, 1000.0, "events")
+    
+    @patch("src.main.search_events_by_radius")
+    def test_search_events_nearby_duplicated_parameters(self, mock_search, search_events_nearby):
+        """Test that the first occurrence of a repeated parameter wins, as with req.args."""
+        req = _search_request("lat=45.46&lat=1.0&lng=9.19&radius=1000&radius=5")
+        
+        search_events_nearby(req)
+        
+        mock_search.assert_called_once_with(45.46, 9.19, 1000.0, "event")
+    
+    @patch("src.main.search_events_by_radius")
+    def test_search_events_nearby_percent_encoded_parameters(self, mock_search, search_events_nearby):
+        """Test that percent-encoded and plus-encoded values are decoded."""
+        req = _search_request("lat=%2B45.46&lng=-9%2E19&radius=1e3&collection=my+events%21")
+        
+        search_events_nearby(req)
+        
+        mock_search.assert_called_once_with(45.46, -9.19, 1000.0, "my events!")
+    
+    @patch("src.main.search_events_by_radius")
+    def test_search_events_nearby_non_utf8_parameters(self, mock_search, search_events_nearby):
+        """Test that raw non-UTF-8 bytes are reported as a bad request."""
+        req = _search_request("lat=45\xff&lng=9.19&radius=1000")
+        
+        result = search_events_nearby(req)
+        
+        assert result.status_code == 400
+        mock_search.assert_not_called()